@@ -7,20 +7,28 @@ Perfect for Obsidian vaults, presentation slides, web assets, and documentation.
 Backs up originals before replacing them.
 """
 
+import functools
 import json
+import os
+import re
 import shutil
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
-from downscale_core import downscale_image_file, format_bytes
+import numpy as np
+from downscale_core import downscale_image_file, format_bytes, jpeg_turbo_enabled
+from PIL import Image, UnidentifiedImageError
 
 # Configuration
-IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"}
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp"})
 DEFAULT_MAX_WIDTH = 1200
 SIZE_THRESHOLD_KB = 500
 DIMENSION_THRESHOLD_PX = 1200
+CACHE_FILENAME = ".image-downscale.cache"
 
 
 def load_config(directory: Path) -> dict[str, Any]:
@@ -53,20 +61,216 @@ def load_config(directory: Path) -> dict[str, Any]:
         return {}
 
 
+def load_scan_cache(directory: Path) -> dict[str, Any]:
+    """
+    Load cached dimension probes from .image-downscale.cache.
+
+    Entries map relative path -> [mtime_ns, file_size, width, height];
+    a stale or unreadable cache is simply ignored.
+
+    Args:
+        directory: Root directory being processed
+
+    Returns:
+        Cache dictionary (empty if missing or invalid)
+    """
+    cache_path = directory / CACHE_FILENAME
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {}
+
+
+def save_scan_cache(directory: Path, cache: dict[str, Any]) -> None:
+    """
+    Persist dimension probes for the next run; failures are non-fatal.
+
+    Entries whose file no longer exists are dropped so the cache doesn't
+    grow without bound as images are deleted or renamed.
+
+    Args:
+        directory: Root directory being processed
+        cache: Cache dictionary to write
+    """
+    cache = {key: entry for key, entry in cache.items() if (directory / key).exists()}
+    cache_path = directory / CACHE_FILENAME
+    try:
+        with open(cache_path, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Warning: Could not write {cache_path.name}: {e}")
+
+
+def _probe_jpeg_size(f) -> Optional[tuple[int, int]]:
+    """Walk JPEG segment markers to the SOFn frame header for dimensions."""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        while code == 0xFF:  # fill bytes before a marker are legal
+            fill = f.read(1)
+            if not fill:
+                return None
+            code = fill[0]
+
+        # Standalone markers (SOI, TEM, RSTn) carry no length field
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        seg_len = int.from_bytes(length_bytes, "big")
+
+        # SOFn (baseline/progressive/etc.) holds the frame dimensions;
+        # C4/C8/CC are DHT/JPG/DAC, not frame headers
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height = int.from_bytes(frame[1:3], "big")
+            width = int.from_bytes(frame[3:5], "big")
+            return (width, height)
+
+        f.seek(seg_len - 2, 1)
+
+
+def probe_image_size(path: Path) -> Optional[tuple[int, int]]:
+    """
+    Read image dimensions from the file header alone.
+
+    Every supported format stores its dimensions within the first few
+    dozen bytes (JPEG needs a short marker walk), so a single small read
+    replaces constructing a full PIL Image per file during the scan.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        (width, height), or None if the format wasn't recognized
+    """
+    with open(path, "rb") as f:
+        head = f.read(32)
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return (int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big"))
+
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return (int.from_bytes(head[6:8], "little"), int.from_bytes(head[8:10], "little"))
+
+        if head.startswith(b"BM") and len(head) >= 26:
+            width = int.from_bytes(head[18:22], "little", signed=True)
+            # Height may be negative for top-down BMPs
+            height = abs(int.from_bytes(head[22:26], "little", signed=True))
+            return (width, height)
+
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP" and len(head) >= 30:
+            chunk = head[12:16]
+            if chunk == b"VP8X":
+                width = int.from_bytes(head[24:27], "little") + 1
+                height = int.from_bytes(head[27:30], "little") + 1
+                return (width, height)
+            if chunk == b"VP8 ":
+                width = int.from_bytes(head[26:28], "little") & 0x3FFF
+                height = int.from_bytes(head[28:30], "little") & 0x3FFF
+                return (width, height)
+            if chunk == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+            return None
+
+        if head.startswith(b"\xff\xd8"):
+            return _probe_jpeg_size(f)
+
+    return None
+
+
 class ImageCandidate:
     """Represents an image that might need downscaling."""
 
-    def __init__(self, path: Path, root_dir: Path):
+    def __init__(
+        self,
+        path: Path,
+        root_dir: Path,
+        stat_result: Optional[os.stat_result] = None,
+        cache: Optional[dict[str, Any]] = None,
+    ):
         self.path = path
         self.root_dir = root_dir
         self.relative_path = path.relative_to(root_dir)
-        self.file_size = path.stat().st_size
+        # The directory walk already has stat data from scandir; only
+        # stat again if a caller constructs a candidate directly
+        if stat_result is None:
+            stat_result = path.stat()
+        self.file_size = stat_result.st_size
+        self.mtime_ns = stat_result.st_mtime_ns
+        self._cache = cache
+        # Filled in by estimate_total_savings for the whole batch at once
+        self.new_size: Optional[tuple[int, int]] = None
+        self.estimated_bytes: Optional[float] = None
+
+    @functools.cached_property
+    def dimensions(self) -> tuple[int, int]:
+        """(width, height), probed once on first access."""
+        key = str(self.relative_path)
+
+        # A cache hit keyed on (mtime, size) skips the file open entirely
+        if self._cache is not None:
+            entry = self._cache.get(key)
+            if entry and entry[0] == self.mtime_ns and entry[1] == self.file_size:
+                return (entry[2], entry[3])
+
+        # Header bytes first; fall back to PIL for anything the
+        # lightweight probe doesn't recognize. Image.open is lazy, so
+        # reading .size parses only the header — no pixel decode.
+        size = probe_image_size(self.path)
+        if size is None:
+            # Restricting open() to the extension's plugin skips Pillow's
+            # accept-function walk over every registered format
+            fmt = Image.registered_extensions().get(self.path.suffix.lower())
+            try:
+                with Image.open(self.path, formats=[fmt] if fmt else None) as img:
+                    size = img.size
+            except UnidentifiedImageError:
+                # Extension doesn't match the content; let every plugin sniff
+                with Image.open(self.path) as img:
+                    size = img.size
+
+        if self._cache is not None:
+            self._cache[key] = [self.mtime_ns, self.file_size, size[0], size[1]]
+        return size
+
+    @functools.cached_property
+    def is_animated(self) -> bool:
+        """
+        True for multi-frame GIF/WebP.
+
+        Downscaling an animated image through the hybrid pipeline would
+        silently flatten it to its first frame, so these are excluded
+        from processing. Only GIF/WebP can carry animation, so other
+        formats answer without touching the file.
+        """
+        if self.path.suffix.lower() not in (".gif", ".webp"):
+            return False
+        try:
+            with Image.open(self.path) as img:
+                return getattr(img, "n_frames", 1) > 1
+        except Exception:
+            return False
 
-        # Get dimensions
-        from PIL import Image  # type: ignore[import-untyped]
+    @property
+    def width(self) -> int:
+        return self.dimensions[0]
 
-        with Image.open(path) as img:
-            self.width, self.height = img.size
+    @property
+    def height(self) -> int:
+        return self.dimensions[1]
 
     @property
     def size_kb(self) -> float:
@@ -79,7 +283,13 @@ class ImageCandidate:
     def exceeds_threshold(
         self, size_kb: int = SIZE_THRESHOLD_KB, dimension_px: int = DIMENSION_THRESHOLD_PX
     ) -> bool:
-        """Check if image exceeds size or dimension thresholds."""
+        """
+        Check if image exceeds size or dimension thresholds.
+
+        The file-size test comes from stat data alone and short-circuits,
+        so files that already qualify on size never get their header
+        opened during filtering.
+        """
         return self.size_kb > size_kb or self.width > dimension_px or self.height > dimension_px
 
     def calculate_downscaled_size(self, max_width: int) -> tuple[int, int]:
@@ -98,22 +308,60 @@ class ImageCandidate:
         )
 
 
+def _walk_image_files(root: Path):
+    """
+    Yield (path, stat_result) for image files under root in a single
+    os.scandir traversal.
+
+    One pass visits each directory exactly once (vs one rglob walk per
+    extension) and reuses the DirEntry type information, so no extra
+    stat() calls are needed to tell files from directories. Hidden
+    directories (including .image-backups) are pruned at walk time
+    instead of being walked and filtered afterwards.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError as e:
+            print(f"Warning: Could not scan {current}: {e}")
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    suffix = os.path.splitext(entry.name)[1].lower()
+                    if suffix in IMAGE_EXTENSIONS:
+                        yield Path(entry.path), entry.stat()
+
+
 def find_images(
-    directory_path: Path, scan_paths: Optional[list[str]] = None
-) -> list[ImageCandidate]:
+    directory_path: Path,
+    scan_paths: Optional[list[str]] = None,
+    cache: Optional[dict[str, Any]] = None,
+) -> Iterator[ImageCandidate]:
     """
     Find all images in the directory recursively.
 
+    Candidates are yielded as the walk discovers them, so callers can
+    filter on the fly instead of materializing every image in the tree —
+    only the images that pass filtering need to stay in memory.
+
     Args:
         directory_path: Root directory to search from
         scan_paths: Optional list of subdirectories to scan (relative to directory_path).
                    If None or empty, scans entire directory_path.
+        cache: Optional dimension cache shared across candidates
+               (see load_scan_cache)
 
-    Returns:
-        List of ImageCandidate objects
+    Yields:
+        ImageCandidate objects
     """
-    images = []
-
     # Determine which paths to scan
     if scan_paths:
         # Scan only specified subdirectories
@@ -125,19 +373,74 @@ def find_images(
         search_roots = [directory_path]
 
     for search_root in search_roots:
-        for ext in IMAGE_EXTENSIONS:
-            for img_path in search_root.rglob(f"*{ext}"):
-                # Skip hidden folders and backup folders
-                if any(part.startswith(".") for part in img_path.parts):
-                    continue
+        for img_path, stat_result in _walk_image_files(search_root):
+            try:
+                yield ImageCandidate(img_path, directory_path, stat_result=stat_result, cache=cache)
+            except Exception as e:
+                print(f"Warning: Could not process {img_path}: {e}")
 
-                try:
-                    candidate = ImageCandidate(img_path, directory_path)
-                    images.append(candidate)
-                except Exception as e:
-                    print(f"Warning: Could not process {img_path}: {e}")
 
-    return images
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)): clone src's extents into dst
+_FICLONE = 0x40049409
+
+
+def _try_reflink(src: Path, dst: Path) -> bool:
+    """
+    Clone src to dst copy-on-write via FICLONE (btrfs/XFS/bcachefs).
+
+    A reflink shares data extents but gets its own inode, so the clone is
+    O(1) regardless of file size and — unlike a hardlink — stays intact
+    even if the source is later rewritten in place. Returns False on
+    non-Linux platforms and filesystems without reflink support.
+    """
+    if sys.platform != "linux":
+        return False
+    try:
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+# Filesystems whose snapshot facilities make a per-file backup redundant
+# (provided the user actually has snapshots scheduled)
+_SNAPSHOT_FSTYPES = frozenset({"btrfs", "zfs"})
+
+
+def is_snapshotted_fs(path: Path) -> bool:
+    """
+    Best-effort check whether path lives on a snapshot-capable filesystem.
+
+    Walks /proc/self/mounts for the longest mount-point prefix of the
+    resolved path and compares its fstype against _SNAPSHOT_FSTYPES.
+    Answers False on non-Linux platforms or when the mount table can't
+    be read — callers treat that as "not snapshotted" and keep backups.
+    """
+    if sys.platform != "linux":
+        return False
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as mounts:
+            entries = [line.split() for line in mounts]
+    except OSError:
+        return False
+
+    resolved = os.path.realpath(path)
+    best_len = -1
+    best_fstype = ""
+    for fields in entries:
+        if len(fields) < 3:
+            continue
+        # Mount points escape whitespace octally in the mount table
+        mount_point = fields[1].replace("\\040", " ").replace("\\011", "\t")
+        if resolved == mount_point or resolved.startswith(mount_point.rstrip("/") + "/"):
+            if len(mount_point) > best_len:
+                best_len = len(mount_point)
+                best_fstype = fields[2]
+    return best_fstype in _SNAPSHOT_FSTYPES
 
 
 def create_backup(image_path: Path, root_dir: Path, backup_date: str) -> Path:
@@ -159,18 +462,399 @@ def create_backup(image_path: Path, root_dir: Path, backup_date: str) -> Path:
     # Create backup directory
     backup_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Copy file
-    shutil.copy2(image_path, backup_path)
+    if backup_path.exists():
+        backup_path.unlink()
+
+    # Cheapest first: a CoW reflink clone (O(1), own inode) on filesystems
+    # that support it; otherwise a hardlink, which shares the original's
+    # data blocks — writers must then replace the original via a new file +
+    # rename (never truncate in place), or they'd clobber the linked backup
+    # too. A full copy remains the cross-device/last-resort fallback.
+    if _try_reflink(image_path, backup_path):
+        shutil.copystat(image_path, backup_path)
+    else:
+        try:
+            os.link(image_path, backup_path)
+        except OSError:
+            shutil.copy2(image_path, backup_path)
 
     return backup_path
 
 
+def filter_candidates(
+    images: Iterator[ImageCandidate], size_threshold: int, dimension_threshold: int
+) -> tuple[int, list[ImageCandidate]]:
+    """
+    Filter streamed images against the thresholds.
+
+    Files over the size threshold qualify from stat data alone. The rest
+    need a dimension probe, which is I/O-bound (a small read per file),
+    so probes run on a thread pool and overlap with the directory walk
+    still in progress. Discovery order is preserved in the result.
+
+    Args:
+        images: Stream of candidates from find_images
+        size_threshold: File size threshold in KB
+        dimension_threshold: Dimension threshold in pixels
+
+    Returns:
+        (total_images_seen, candidates exceeding thresholds)
+    """
+    total_images = 0
+    keep: list[tuple[int, ImageCandidate]] = []
+    pending = []
+
+    def _qualifies(img: ImageCandidate) -> bool:
+        if not (
+            img.size_kb > size_threshold
+            or img.width > dimension_threshold
+            or img.height > dimension_threshold
+        ):
+            return False
+        if img.is_animated:
+            print(f"Skipping animated image (resizing would drop frames): {img.relative_path}")
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        for img in images:
+            index = total_images
+            total_images += 1
+            # Size-qualified stills need no file I/O at all; everything
+            # else (dimension probe and/or animation check) goes to the pool
+            if img.size_kb > size_threshold and img.path.suffix.lower() not in (".gif", ".webp"):
+                keep.append((index, img))
+            else:
+                pending.append((index, img, pool.submit(_qualifies, img)))
+
+        for index, img, future in pending:
+            try:
+                if future.result():
+                    keep.append((index, img))
+            except Exception as e:
+                # Dimension probe can fail on truncated/unreadable files
+                print(f"Warning: Could not process {img.path}: {e}")
+
+    keep.sort(key=lambda pair: pair[0])
+    return total_images, [img for _, img in keep]
+
+
+def estimate_total_savings(candidates: list[ImageCandidate], max_width: int) -> int:
+    """
+    Estimate total bytes saved if every candidate were downscaled.
+
+    Works on structure-of-arrays columns (sizes, widths, heights) so the
+    per-candidate pixel-ratio arithmetic runs as a handful of NumPy array
+    ops instead of a Python loop over objects. As a side effect each
+    candidate's new_size and estimated_bytes are filled in, leaving the
+    interactive prompt loop with pure formatting work.
+
+    Args:
+        candidates: Images to estimate (dimensions probe lazily if needed)
+        max_width: Maximum width for downscaled images
+
+    Returns:
+        Estimated total bytes saved
+    """
+    if not candidates:
+        return 0
+
+    sizes = np.array([c.file_size for c in candidates], dtype=np.float64)
+    widths = np.array([c.width for c in candidates], dtype=np.float64)
+    heights = np.array([c.height for c in candidates], dtype=np.float64)
+
+    # Same arithmetic as calculate_downscaled_size / the per-image prompt:
+    # bytes scale with pixel count; images already within max_width keep
+    # their dimensions and save nothing
+    new_widths = np.minimum(widths, max_width)
+    new_heights = np.where(widths > max_width, heights * max_width / widths, heights)
+    new_heights = new_heights.astype(np.int64)
+    estimated = sizes * (new_widths * new_heights) / (widths * heights)
+
+    for candidate, new_w, new_h, est in zip(candidates, new_widths, new_heights, estimated):
+        candidate.new_size = (int(new_w), int(new_h))
+        candidate.estimated_bytes = float(est)
+
+    savings = np.maximum(sizes - estimated, 0)
+    return int(savings.sum())
+
+
+def process_image(
+    image_path: Path,
+    root_dir: Path,
+    backup_date: str,
+    max_width: int,
+    image: Optional[Any] = None,
+    to_webp: bool = False,
+    skip_backup: bool = False,
+) -> dict[str, Any]:
+    """
+    Back up and downscale a single image in place.
+
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+
+    Args:
+        image_path: Path to the image to process
+        root_dir: Root directory being processed
+        backup_date: Date string for backup folder (YYYY-MM-DD)
+        max_width: Maximum width for the downscaled image
+        image: Optional pre-decoded PIL image (see downscale_image_file)
+        to_webp: If True, PNG sources are re-encoded as .webp siblings
+            and the original .png is removed
+        skip_backup: If True, don't back up first (the caller has verified
+            a filesystem snapshot covers the original)
+
+    Returns:
+        Result dictionary from downscale_image_file, plus 'backup_path'
+        (None when skipped) and 'output_path' (differs from image_path
+        after conversion)
+    """
+    backup_path = None if skip_backup else create_backup(image_path, root_dir, backup_date)
+
+    try:
+        # An unrelated .webp sibling may already exist (or be mid-write in
+        # another worker); converting would clobber it with no backup, so
+        # fall back to re-encoding the PNG in place instead
+        if (
+            to_webp
+            and image_path.suffix.lower() == ".png"
+            and image_path.with_suffix(".webp").exists()
+        ):
+            print(f"  ! {image_path.name}: .webp sibling exists, keeping PNG")
+            to_webp = False
+
+        if to_webp and image_path.suffix.lower() == ".png":
+            # Conversion writes a new .webp next to the original, so no
+            # replace dance is needed; the .png goes away on success
+            output_path = image_path.with_suffix(".webp")
+            try:
+                result = downscale_image_file(
+                    image_path, output_path, max_width=max_width, image=image
+                )
+                image_path.unlink()
+            except Exception:
+                output_path.unlink(missing_ok=True)
+                raise
+        else:
+            output_path = image_path
+            result = _encode_replace(image_path, max_width, image=image)
+    except Exception:
+        # Without a backup there is nothing to restore, but the replace
+        # strategies only remove the original after a successful encode,
+        # so a failure here leaves it untouched anyway
+        if backup_path is not None:
+            _restore_backup(backup_path, image_path)
+        raise
+
+    result["backup_path"] = backup_path
+    result["output_path"] = output_path
+    return result
+
+
+def _encode_replace(
+    image_path: Path, max_width: int, image: Optional[Any] = None
+) -> dict[str, Any]:
+    """
+    Encode the downscaled output and take the original's place.
+
+    Never truncates the original in place — the backup may be a hardlink
+    to its inode. On Linux the output goes to an unlinked O_TMPFILE in
+    the same directory and is linked over the original, so cloud-sync
+    clients watching the vault (iCloud/Syncthing/OneDrive) never see a
+    transient .tmp file to upload. Elsewhere, or when the filesystem
+    lacks O_TMPFILE, falls back to a visible temp file + atomic rename
+    (with the real extension kept last so PIL can infer the format).
+    """
+    if hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd"):
+        try:
+            fd = os.open(image_path.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            fd = -1
+        if fd >= 0:
+            with os.fdopen(fd, "wb") as anon:
+                result = downscale_image_file(
+                    image_path, image_path, max_width=max_width, image=image, output_file=anon
+                )
+                # linkat cannot overwrite, so drop the original first; a
+                # crash in between still leaves the backup. The dir_fd
+                # form forces linkat, which resolves the /proc magic
+                # symlink to the anonymous file (plain link(2) would not).
+                dir_fd = os.open(image_path.parent, os.O_DIRECTORY)
+                try:
+                    image_path.unlink()
+                    os.link(
+                        f"/proc/self/fd/{anon.fileno()}",
+                        image_path.name,
+                        dst_dir_fd=dir_fd,
+                        follow_symlinks=True,
+                    )
+                finally:
+                    os.close(dir_fd)
+            return result
+
+    temp_path = image_path.with_suffix(".tmp" + image_path.suffix)
+    try:
+        result = downscale_image_file(image_path, temp_path, max_width=max_width, image=image)
+        os.replace(temp_path, image_path)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return result
+
+
+def _restore_backup(backup_path: Path, image_path: Path) -> bool:
+    """
+    Copy a backup over the original after a failed processing attempt.
+
+    No-op when the backup hardlinks the original's inode (nothing was
+    damaged) or when the backup is missing. A missing original — possible
+    if a crash lands in _encode_replace's unlink/link window — is the
+    case that most needs the copy, so only the hardlink check requires
+    both files to exist.
+    """
+    try:
+        if backup_path.exists():
+            if image_path.exists() and os.path.samefile(backup_path, image_path):
+                return False
+            shutil.copy2(backup_path, image_path)
+            return True
+    except OSError:
+        pass
+    return False
+
+
+def rewrite_markdown_links(root_dir: Path, renames: dict[str, str]) -> int:
+    """
+    Update image references in .md files after filename changes.
+
+    Obsidian links embed the image filename (``![[shot.png]]`` or
+    ``![](attachments/shot.png)``), so a suffix change from conversion
+    breaks them. Does one pass over the vault's markdown, replacing old
+    filenames with new ones.
+
+    Args:
+        root_dir: Root directory being processed
+        renames: Mapping of old filename -> new filename
+
+    Returns:
+        Number of markdown files updated
+    """
+    if not renames:
+        return 0
+
+    # Only replace whole link targets: the filename must start the string
+    # or follow a link/path boundary character, so a rename of shot.png
+    # never rewrites the tail of my-shot.png
+    patterns = [
+        (re.compile(r"(?<![^\[\(/\\|\s])" + re.escape(old_name)), new_name)
+        for old_name, new_name in renames.items()
+    ]
+
+    updated = 0
+    for md_path in root_dir.rglob("*.md"):
+        if any(part.startswith(".") for part in md_path.parts):
+            continue
+        try:
+            text = md_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not read {md_path}: {e}")
+            continue
+
+        new_text = text
+        for pattern, new_name in patterns:
+            new_text = pattern.sub(new_name, new_text)
+
+        if new_text != text:
+            try:
+                md_path.write_text(new_text, encoding="utf-8")
+                updated += 1
+            except OSError as e:
+                print(f"Warning: Could not update {md_path}: {e}")
+
+    return updated
+
+
+def process_candidates_parallel(
+    candidates: list[ImageCandidate],
+    root_dir: Path,
+    backup_date: str,
+    max_width: int,
+    to_webp: bool = False,
+    renames: Optional[dict[str, str]] = None,
+    max_workers: Optional[int] = None,
+    skip_backup: bool = False,
+) -> tuple[int, int, int]:
+    """
+    Process candidates concurrently across CPU cores.
+
+    Each image is independent (backup + downscale + replace), so the
+    non-interactive path fans out over a process pool for near-linear
+    speedup with core count. One bad image fails its own future without
+    poisoning the rest of the batch.
+
+    Args:
+        candidates: Images to process
+        root_dir: Root directory being processed
+        backup_date: Date string for backup folder (YYYY-MM-DD)
+        max_width: Maximum width for downscaled images
+        to_webp: If True, PNG sources are converted to .webp
+        renames: If given, filled with old -> new filenames of conversions
+        max_workers: Worker process count (default: all cores)
+        skip_backup: If True, skip per-image backups (snapshots cover them)
+
+    Returns:
+        (processed_count, failed_count, total_bytes_saved)
+    """
+    processed_count = 0
+    failed_count = 0
+    total_saved = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                process_image,
+                candidate.path,
+                root_dir,
+                backup_date,
+                max_width,
+                to_webp=to_webp,
+                skip_backup=skip_backup,
+            ): candidate
+            for candidate in candidates
+        }
+
+        for future in as_completed(futures):
+            candidate = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  ✗ Error processing {candidate.relative_path}: {e}")
+                failed_count += 1
+                continue
+
+            if renames is not None and result["output_path"].name != candidate.path.name:
+                renames[candidate.path.name] = result["output_path"].name
+
+            total_saved += result["bytes_saved"]
+            processed_count += 1
+            print(
+                f"  ✓ {candidate.relative_path}: "
+                f"{result['target_size'][0]}x{result['target_size'][1]} "
+                f"(saved {format_bytes(result['bytes_saved'])})"
+            )
+
+    return processed_count, failed_count, total_saved
+
+
 def process_directory(
     directory_path: Path,
     max_width: int = DEFAULT_MAX_WIDTH,
     dry_run: bool = False,
     auto_yes: bool = False,
     config_override: Optional[dict[str, Any]] = None,
+    to_webp: bool = False,
+    parallel: Optional[int] = None,
+    no_backup_if_snapshotted: bool = False,
 ) -> None:
     """
     Interactively process images in a directory.
@@ -181,6 +865,10 @@ def process_directory(
         dry_run: If True, don't actually modify files
         auto_yes: If True, process all without prompting
         config_override: Optional config dict to use instead of loading from file
+        to_webp: If True, convert PNG sources to WebP while downscaling
+        parallel: Worker processes for --yes mode (default: all cores)
+        no_backup_if_snapshotted: If True, skip per-image backups when the
+            directory sits on a snapshot-capable filesystem (btrfs/ZFS)
     """
     if not directory_path.exists():
         print(f"Error: Directory not found at {directory_path}")
@@ -194,6 +882,10 @@ def process_directory(
     size_threshold = config.get("size_threshold_kb", SIZE_THRESHOLD_KB)
     dimension_threshold = config.get("dimension_threshold_px", DIMENSION_THRESHOLD_PX)
     configured_max_width = config.get("max_width", max_width)
+    to_webp = to_webp or config.get("convert_to_webp", False)
+    no_backup_if_snapshotted = no_backup_if_snapshotted or config.get(
+        "no_backup_if_snapshotted", False
+    )
 
     # CLI arg takes precedence over config
     if max_width != DEFAULT_MAX_WIDTH:
@@ -204,120 +896,285 @@ def process_directory(
         print(f"Scan paths: {', '.join(scan_paths)}")
     print("=" * 80)
 
-    # Find all images
-    all_images = find_images(directory_path, scan_paths)
-    print(f"Found {len(all_images)} total images")
+    # Dimension probes from previous runs are reused when (mtime, size) match
+    scan_cache = load_scan_cache(directory_path)
 
-    # Filter to candidates that exceed thresholds (use configured thresholds)
-    candidates = [
-        img
-        for img in all_images
-        if img.exceeds_threshold(size_kb=size_threshold, dimension_px=dimension_threshold)
-    ]
+    # Stream discovery and filter on the fly (using configured thresholds);
+    # dimension probes overlap the walk on a thread pool
+    total_images, candidates = filter_candidates(
+        find_images(directory_path, scan_paths, cache=scan_cache),
+        size_threshold,
+        dimension_threshold,
+    )
+
+    print(f"Found {total_images} total images")
 
     if not candidates:
+        if not dry_run:
+            save_scan_cache(directory_path, scan_cache)
         print("No images exceed the size or dimension thresholds.")
         print(f"Thresholds: >{size_threshold}KB or >{dimension_threshold}px")
         return
 
-    print(f"Found {len(candidates)} images exceeding thresholds:\n")
-
-    # Prepare backup date
-    backup_date = datetime.now().strftime("%Y-%m-%d")
-
-    # Statistics
-    processed_count = 0
-    skipped_count = 0
-    total_saved = 0
-
-    # Process each candidate
-    for i, candidate in enumerate(candidates, 1):
-        print(f"\nImage {i}/{len(candidates)}: {candidate.relative_path}")
-        print(
-            f"  Current: {candidate.width}x{candidate.height} ({format_bytes(candidate.file_size)})"
-        )
-
-        new_width, new_height = candidate.calculate_downscaled_size(configured_max_width)
-        estimated_size = (
-            candidate.file_size * (new_width * new_height) / (candidate.width * candidate.height)
-        )
-
-        if new_width < candidate.width:
-            print(
-                f"  Would downscale to: {new_width}x{new_height} (~{format_bytes(int(estimated_size))})"
-            )
-            estimated_savings = candidate.file_size - estimated_size
-            print(f"  Estimated savings: {format_bytes(int(estimated_savings))}")
-        else:
-            print("  Already within max width, would optimize only")
-
-        # Prompt user
-        if auto_yes:
-            response = "y"
-        elif dry_run:
-            response = "skip"
-        else:
-            response = input("\n  Process this image? [y/n/skip-all/quit]: ").lower()
-
-        if response == "quit" or response == "q":
-            print("\nQuitting...")
-            break
-        elif response == "skip-all" or response == "s":
-            print("\nSkipping remaining images...")
-            break
-        elif response != "y" and response != "yes":
-            print("  Skipped")
-            skipped_count += 1
-            continue
-
-        if dry_run:
-            print("  [DRY RUN] Would process this image")
-            continue
-
-        # Process the image
+    # Idempotent re-runs: exceeds_threshold uses OR semantics, so a small
+    # file can still qualify on height alone. Downscaling keys off width,
+    # so anything already within max width and under the size threshold
+    # would be a pure re-encode with nothing to gain — skip it up front.
+    already_optimized = 0
+    remaining = []
+    for candidate in candidates:
+        # Size-qualified candidates skipped the probe during filtering, so
+        # this width access can be the first read of a corrupt file
         try:
-            # Create backup
-            backup_path = create_backup(candidate.path, directory_path, backup_date)
-            print(f"  ✓ Backed up to {backup_path.relative_to(directory_path)}")
+            within_width = candidate.width <= configured_max_width
+        except Exception as e:
+            print(f"Warning: Could not process {candidate.path}: {e}")
+            continue
+        if within_width and candidate.size_kb <= size_threshold:
+            print(f"Skipping already-optimized image: {candidate.relative_path}")
+            already_optimized += 1
+        else:
+            remaining.append(candidate)
+    candidates = remaining
 
-            # Downscale to temporary location
-            temp_path = candidate.path.with_suffix(candidate.path.suffix + ".tmp")
-            result = downscale_image_file(candidate.path, temp_path, max_width=configured_max_width)
+    # Size-qualified candidates get their first dimension probe in the
+    # loop above, not during filtering, so the cache is only complete
+    # from here on. A dry run must not modify the vault, and that
+    # includes the cache file.
+    if not dry_run:
+        save_scan_cache(directory_path, scan_cache)
 
-            # Replace original
-            temp_path.replace(candidate.path)
+    if not candidates:
+        print("All qualifying images are already optimized.")
+        return
 
-            bytes_saved = result["bytes_saved"]
-            total_saved += bytes_saved
+    print(f"Found {len(candidates)} images exceeding thresholds")
+    estimated_total = estimate_total_savings(candidates, configured_max_width)
+    print(f"Estimated total savings: {format_bytes(estimated_total)}\n")
 
-            print(f"  ✓ Downscaled: {result['target_size'][0]}x{result['target_size'][1]}")
-            print(f"  ✓ Saved: {format_bytes(bytes_saved)}")
+    # Prepare backup date
+    backup_date = datetime.now().strftime("%Y-%m-%d")
 
-            processed_count += 1
+    # Backup is only skipped when explicitly requested AND the directory
+    # actually sits on a snapshot-capable filesystem; the user remains
+    # responsible for having snapshots scheduled on it
+    skip_backup = no_backup_if_snapshotted and is_snapshotted_fs(directory_path)
+    if skip_backup:
+        print("Skipping per-image backups (snapshot-capable filesystem detected)\n")
+    elif no_backup_if_snapshotted:
+        print("Filesystem is not snapshot-capable; keeping per-image backups\n")
+
+    # Filename changes (PNG -> WebP) collected for markdown link rewriting
+    renames: dict[str, str] = {}
+
+    if auto_yes and not dry_run:
+        # Non-interactive: per-image work is independent, so fan out across cores
+        workers = parallel or os.cpu_count()
+        print(f"Processing {len(candidates)} images on {workers} worker(s)...\n")
+        skipped_count = 0
+        processed_count, failed_count, total_saved = process_candidates_parallel(
+            candidates,
+            directory_path,
+            backup_date,
+            configured_max_width,
+            to_webp=to_webp,
+            renames=renames,
+            max_workers=workers,
+            skip_backup=skip_backup,
+        )
+    else:
+        failed_count = 0
+        processed_count, skipped_count, total_saved = process_candidates_interactive(
+            candidates,
+            directory_path,
+            backup_date,
+            configured_max_width,
+            dry_run,
+            auto_yes,
+            to_webp=to_webp,
+            renames=renames,
+            skip_backup=skip_backup,
+        )
 
-        except Exception as e:
-            print(f"  ✗ Error processing image: {e}")
-            # Restore from backup if it exists
-            if backup_path.exists():
-                shutil.copy2(backup_path, candidate.path)
-                print("  ✓ Restored from backup")
-            continue
+    if renames:
+        updated_notes = rewrite_markdown_links(directory_path, renames)
+        print(f"\nUpdated image links in {updated_notes} markdown file(s)")
 
     # Print summary
     print("\n" + "=" * 80)
     print("Summary")
     print("=" * 80)
     print(f"Processed: {processed_count} images")
-    print(f"Skipped: {skipped_count} images")
+    print(f"Skipped: {skipped_count + already_optimized} images")
+    if failed_count:
+        print(f"Failed: {failed_count} images")
 
     if not dry_run:
         print(f"Total space saved: {format_bytes(total_saved)}")
-        if processed_count > 0:
+        if processed_count > 0 and not skip_backup:
             print(f"\nBackups stored in: {directory_path}/.image-backups/{backup_date}/")
             print("To restore an image:")
             print(f"  cp .image-backups/{backup_date}/path/to/image.png path/to/image.png")
 
 
+def process_candidates_interactive(
+    candidates: list[ImageCandidate],
+    directory_path: Path,
+    backup_date: str,
+    configured_max_width: int,
+    dry_run: bool,
+    auto_yes: bool,
+    to_webp: bool = False,
+    renames: Optional[dict[str, str]] = None,
+    skip_backup: bool = False,
+) -> tuple[int, int, int]:
+    """
+    Process candidates one at a time, prompting for each.
+
+    Args:
+        candidates: Images to process
+        directory_path: Root directory being processed
+        backup_date: Date string for backup folder (YYYY-MM-DD)
+        configured_max_width: Maximum width for downscaled images
+        dry_run: If True, don't actually modify files
+        auto_yes: If True, process all without prompting
+        to_webp: If True, PNG sources are converted to .webp
+        renames: If given, filled with old -> new filenames of conversions
+        skip_backup: If True, skip per-image backups (snapshots cover them)
+
+    Returns:
+        (processed_count, skipped_count, total_bytes_saved)
+    """
+    processed_count = 0
+    skipped_count = 0
+    total_saved = 0
+
+    def _decode(path: Path):
+        """Fully decode an image; runs off-thread (PIL releases the GIL)."""
+        img = Image.open(path)
+        img.load()
+        return img
+
+    def _discard(future) -> None:
+        """Close a prefetched decode that won't be used."""
+        if future is not None:
+            future.add_done_callback(lambda f: f.exception() or f.result().close())
+
+    # One background thread keeps the pipeline a single stage deep: while
+    # the user reads the prompt and the current image encodes, the next
+    # candidate's decode is already underway
+    prefetch_pool = ThreadPoolExecutor(max_workers=1)
+    prefetched = None
+    next_future = None
+
+    try:
+        # Process each candidate
+        for i, candidate in enumerate(candidates, 1):
+            prefetched = next_future
+            next_future = None
+            if not dry_run and i < len(candidates):
+                next_future = prefetch_pool.submit(_decode, candidates[i].path)
+
+            print(f"\nImage {i}/{len(candidates)}: {candidate.relative_path}")
+            print(
+                f"  Current: {candidate.width}x{candidate.height} ({format_bytes(candidate.file_size)})"
+            )
+
+            # Precomputed by the vectorized batch pass where available
+            if candidate.new_size is not None and candidate.estimated_bytes is not None:
+                new_width, new_height = candidate.new_size
+                estimated_size = candidate.estimated_bytes
+            else:
+                new_width, new_height = candidate.calculate_downscaled_size(configured_max_width)
+                estimated_size = (
+                    candidate.file_size
+                    * (new_width * new_height)
+                    / (candidate.width * candidate.height)
+                )
+
+            if new_width < candidate.width:
+                print(
+                    f"  Would downscale to: {new_width}x{new_height} (~{format_bytes(int(estimated_size))})"
+                )
+                estimated_savings = candidate.file_size - estimated_size
+                print(f"  Estimated savings: {format_bytes(int(estimated_savings))}")
+            else:
+                print("  Already within max width, would optimize only")
+
+            # Prompt user
+            if auto_yes:
+                response = "y"
+            elif dry_run:
+                response = "skip"
+            else:
+                response = input("\n  Process this image? [y/n/skip-all/quit]: ").lower()
+
+            if response == "quit" or response == "q":
+                print("\nQuitting...")
+                break
+            elif response == "skip-all" or response == "s":
+                print("\nSkipping remaining images...")
+                break
+            elif response != "y" and response != "yes":
+                print("  Skipped")
+                skipped_count += 1
+                _discard(prefetched)
+                prefetched = None
+                continue
+
+            if dry_run:
+                print("  [DRY RUN] Would process this image")
+                continue
+
+            # Collect this candidate's prefetched decode, if any (the
+            # first image has none and decodes inside downscale)
+            decoded = None
+            if prefetched is not None:
+                try:
+                    decoded = prefetched.result()
+                except Exception:
+                    decoded = None
+                prefetched = None
+
+            # Process the image (backup + encode + replace; restores from
+            # backup internally on failure)
+            try:
+                result = process_image(
+                    candidate.path,
+                    directory_path,
+                    backup_date,
+                    configured_max_width,
+                    image=decoded,
+                    to_webp=to_webp,
+                    skip_backup=skip_backup,
+                )
+
+                if result["backup_path"] is not None:
+                    print(f"  ✓ Backed up to {result['backup_path'].relative_to(directory_path)}")
+                if renames is not None and result["output_path"].name != candidate.path.name:
+                    renames[candidate.path.name] = result["output_path"].name
+                    print(f"  ✓ Converted to {result['output_path'].name}")
+
+                bytes_saved = result["bytes_saved"]
+                total_saved += bytes_saved
+
+                print(f"  ✓ Downscaled: {result['target_size'][0]}x{result['target_size'][1]}")
+                print(f"  ✓ Saved: {format_bytes(bytes_saved)}")
+
+                processed_count += 1
+
+            except Exception as e:
+                print(f"  ✗ Error processing image: {e}")
+                continue
+    finally:
+        # Release any decodes still in flight after a quit/skip-all
+        _discard(prefetched)
+        _discard(next_future)
+        prefetch_pool.shutdown(wait=False)
+
+    return processed_count, skipped_count, total_saved
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -377,8 +1234,33 @@ Thresholds (configurable in script):
         "--yes", "-y", action="store_true", help="Auto-process all images without prompting"
     )
 
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker processes for --yes mode (default: all cores)",
+    )
+
+    parser.add_argument(
+        "--to-webp",
+        action="store_true",
+        help="Convert PNG images to WebP (lossless) instead of re-encoding as PNG, "
+        "and rewrite markdown links to the new filenames",
+    )
+
+    parser.add_argument(
+        "--no-backup-if-snapshotted",
+        action="store_true",
+        help="Skip per-image backups when the directory is on a snapshot-capable "
+        "filesystem (btrfs/ZFS); you are responsible for having snapshots enabled",
+    )
+
     args = parser.parse_args()
 
+    if args.parallel is not None and args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+
     print("Image Downscaler")
     print("=" * 80)
     print(f"Max width: {args.max_width}px")
@@ -386,10 +1268,18 @@ Thresholds (configurable in script):
     print(
         f"Mode: {'DRY RUN' if args.dry_run else 'Interactive' if not args.yes else 'Auto-process'}"
     )
+    if not jpeg_turbo_enabled():
+        print("Note: Pillow built without libjpeg-turbo; JPEG decode/encode will be 2-4x slower")
     print("")
 
     process_directory(
-        args.directory_path, max_width=args.max_width, dry_run=args.dry_run, auto_yes=args.yes
+        args.directory_path,
+        max_width=args.max_width,
+        dry_run=args.dry_run,
+        auto_yes=args.yes,
+        to_webp=args.to_webp,
+        parallel=args.parallel,
+        no_backup_if_snapshotted=args.no_backup_if_snapshotted,
     )
 
 